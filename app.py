@@ -8,6 +8,11 @@ import uuid
 import threading
 import time
 import smtplib
+import csv
+import io
+import html
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
@@ -24,6 +29,20 @@ EMAIL_USER = os.getenv("EMAIL_USER")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
 RECIPIENT_EMAILS = ["harshith@acutant.com"] # TODO: Change this
 
+# --- Share I/O Configuration ---
+# Maximum number of filesystem operations (walks, folder creation) allowed against the share at once
+FS_MAX_CONCURRENT = int(os.getenv("FS_MAX_CONCURRENT", "4"))
+# How long finished task results stay available for the results pages and JSON downloads
+TASK_RETENTION_SECONDS = int(os.getenv("TASK_RETENTION_SECONDS", "3600"))
+# Number of clients a background /create job builds in parallel
+CREATE_MAX_WORKERS = int(os.getenv("CREATE_MAX_WORKERS", "4"))
+# /create submissions with at most this many typed-in clients (and no CSV) run in the interactive lane
+INTERACTIVE_CREATE_LIMIT = int(os.getenv("INTERACTIVE_CREATE_LIMIT", "3"))
+# Largest request body (e.g. a client CSV upload) accepted, in megabytes
+MAX_UPLOAD_MB = int(os.getenv("MAX_UPLOAD_MB", "5"))
+
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_MB * 1024 * 1024
+
 # === UTILITY FUNCTIONS (from original script) ===
 def timestamp():
     return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -147,7 +166,8 @@ def create_structure(base_path, nodes, log_lines, dir_lines, depth=0):
         folder_path = os.path.join(base_path, folder)
 
         if not os.path.exists(folder_path):
-            os.makedirs(folder_path)
+            # exist_ok guards against another worker creating the same folder in between
+            os.makedirs(folder_path, exist_ok=True)
             log_lines.append(f"[{timestamp()}] Created folder: {folder_path}")
         else:
             log_lines.append(f"[{timestamp()}] Folder already exists: {folder_path}")
@@ -171,7 +191,64 @@ def create_structure(base_path, nodes, log_lines, dir_lines, depth=0):
         if node["children"]:
             create_structure(folder_path, node["children"], log_lines, dir_lines, depth + 1)
 
-def write_verification_log(path_to_verify, counts, missing_items, added_items):
+def create_client_structure(client, base_path, structure, lane):
+    """Creates one client's folder tree, log.txt and DirectoryStructure.txt. Returns the log lines.
+
+    A share slot in the given scheduler lane is taken per top-level template folder and per
+    subtree below it rather than for the whole client, so batch builds give way to queued
+    interactive requests often.
+    """
+    log_lines = []
+    dir_lines = []
+
+    log_lines.append(f"\n=== Run started on {current_date_time()} for client: {client} ===\n")
+
+    client_folder = os.path.join(base_path, sanitize_folder_name(client))
+    with fs_scheduler.slot(lane):
+        if not os.path.exists(client_folder):
+            os.makedirs(client_folder, exist_ok=True)
+            log_lines.append(f"[{timestamp()}] Created client main folder: {client_folder}")
+        else:
+            log_lines.append(f"[{timestamp()}] Client folder already exists: {client_folder}")
+
+    dir_lines.append(f"{client}/")
+
+    for node in structure:
+        with fs_scheduler.slot(lane):
+            create_structure(client_folder, [dict(node, children=[])], log_lines, dir_lines, depth=1)
+        node_folder = os.path.join(client_folder, sanitize_folder_name(node["name"]))
+        for child in node["children"]:
+            with fs_scheduler.slot(lane):
+                create_structure(node_folder, [child], log_lines, dir_lines, depth=2)
+
+    with fs_scheduler.slot(lane):
+        # Append logs to existing log.txt
+        with open(os.path.join(client_folder, "log.txt"), "a", encoding="utf-8") as f:
+            f.write("\n".join(log_lines))
+            f.write("\n")
+
+        header = f"Directory Structure for Client: {client}\nGenerated on: {current_date_time()}\n\n"
+        with open(os.path.join(client_folder, "DirectoryStructure.txt"), "w", encoding="utf-8") as f:
+            f.write(header)
+            f.write("\n".join(dir_lines))
+            f.write("\n\nThis folder structure was auto-generated by the Acutant Folder Builder Tool.")
+
+    return log_lines
+
+def parse_client_csv(file_storage):
+    """Reads client names from the first column of an uploaded CSV, skipping an optional header row."""
+    reader = csv.reader(io.StringIO(file_storage.read().decode("utf-8-sig")))
+    clients = []
+    for idx, row in enumerate(reader):
+        name = row[0].strip() if row else ""
+        if not name:
+            continue
+        if idx == 0 and name.lower() in ("client", "client name", "client names", "client_name"):
+            continue
+        clients.append(name)
+    return clients
+
+def write_verification_log(path_to_verify, counts, missing_items, added_items, unreadable_items=None):
     """Writes a summary to log.txt and detailed changes to changes.txt."""
     # First, check if the directory exists. If not, do nothing.
     if not os.path.isdir(path_to_verify):
@@ -184,6 +261,8 @@ def write_verification_log(path_to_verify, counts, missing_items, added_items):
     log_summary_content.append(f"- Items OK: {counts.get('green', 0)}")
     log_summary_content.append(f"- Items Missing: {counts.get('red', 0)}")
     log_summary_content.append(f"- Items Added: {counts.get('yellow', 0)}")
+    if counts.get('error', 0):
+        log_summary_content.append(f"- Folders Unreadable: {counts['error']}")
     
     log_file_path = os.path.join(path_to_verify, "log.txt")
     with open(log_file_path, "a", encoding="utf-8") as f:
@@ -200,8 +279,12 @@ def write_verification_log(path_to_verify, counts, missing_items, added_items):
     if added_items:
         changes_content.append("\n--- Added Items ---")
         changes_content.extend(added_items)
+
+    if unreadable_items:
+        changes_content.append("\n--- Unreadable Folders (contents not checked) ---")
+        changes_content.extend(unreadable_items)
     
-    if not missing_items and not added_items:
+    if not missing_items and not added_items and not unreadable_items:
         changes_content.append("No changes detected. The structure is correct.")
 
     changes_file_path = os.path.join(path_to_verify, "changes.txt")
@@ -233,12 +316,12 @@ def send_email(html_content, subject):
     except Exception as e:
         print(f"[{timestamp()}] An error occurred while sending the email: {e}")
 
-def get_files_in_path(path):
-    """Helper to get a set of files in a given directory, returns empty set if path not found."""
-    return {item for item in os.listdir(path) if os.path.isfile(os.path.join(path, item))} if os.path.isdir(path) else set()
+def build_comparison_views(expected_nodes, actual_nodes, counts, base_verify_path, missing_items, added_items, depth=0, usage_rows=None, unreadable_items=None):
+    """Recursively builds and compares ideal and actual structures to generate color-coded ASCII trees.
 
-def build_comparison_views(expected_nodes, actual_nodes, counts, base_verify_path, missing_items, added_items, depth=0):
-    """Recursively builds and compares ideal and actual structures to generate color-coded ASCII trees."""
+    If usage_rows is given, the usage of every folder found on disk is appended to it.
+    Folders that could not be listed are counted under 'error' and their subtree is not compared.
+    """
     ideal_lines = []
     actual_lines = []
 
@@ -255,19 +338,38 @@ def build_comparison_views(expected_nodes, actual_nodes, counts, base_verify_pat
         expected_node = next((n for n in expected_nodes if n['name'] == name), None)
         actual_node = next((n for n in actual_nodes if n['name'] == name), None)
 
+        usage_label = ""
+        if actual_node and 'usage' in actual_node:
+            usage = actual_node['usage']
+            usage_label = f' <span class="usage-info">({usage["total_files"]} files, {format_size(usage["total_bytes"])})</span>'
+            if usage_rows is not None:
+                usage_rows.append({'path': actual_node.get('path', name), 'expected': expected_node is not None,
+                                   'unreadable': actual_node.get('unreadable', False), **usage_to_json(usage)})
+
+        if actual_node and actual_node.get('unreadable'):
+            # Its contents are unknown, so don't report them as missing
+            if expected_node:
+                ideal_lines.append(f'<span class="status-red">{prefix}{name}</span>')
+            else:
+                ideal_lines.append(f'<span class="status-placeholder">{prefix}</span>')
+            actual_lines.append(f'<span class="status-red">{prefix}{name} (unreadable)</span>')
+            counts['error'] = counts.get('error', 0) + 1
+            if unreadable_items is not None:
+                unreadable_items.append(os.path.join(base_verify_path, actual_node.get('path', name)))
+            continue
+
         if expected_node and actual_node:
             # Green: All OK
             ideal_lines.append(f'<span class="status-green">{prefix}{name}</span>')
-            actual_lines.append(f'<span class="status-green">{prefix}{name}</span>')
+            actual_lines.append(f'<span class="status-green">{prefix}{name}</span>{usage_label}')
             counts['green'] += 1
 
             # Check for README.txt if expected
             if expected_node.get('readme'):
                 readme_prefix = "│&nbsp;&nbsp; " * (depth + 1) + "├── "
-                # Construct the full path for the current node to check for files
+                # Full path of the current node, used when reporting a missing README
                 full_actual_path = os.path.join(base_verify_path, *actual_node.get('path', '').split(os.sep))
-                actual_files = get_files_in_path(full_actual_path)
-                if 'README.txt' in actual_files:
+                if actual_node['has_readme']:
                     ideal_lines.append(f'<span class="status-green">{readme_prefix}README.txt</span>')
                 else:
                     ideal_lines.append(f'<span class="status-red">{readme_prefix}README.txt</span>')
@@ -282,7 +384,7 @@ def build_comparison_views(expected_nodes, actual_nodes, counts, base_verify_pat
         elif not expected_node and actual_node:
             # Yellow: Added
             ideal_lines.append(f'<span class="status-placeholder">{prefix}</span>')
-            actual_lines.append(f'<span class="status-yellow">{prefix}{name}</span>')
+            actual_lines.append(f'<span class="status-yellow">{prefix}{name}</span>{usage_label}')
             counts['yellow'] += 1
             added_items.append(current_path)
 
@@ -290,7 +392,7 @@ def build_comparison_views(expected_nodes, actual_nodes, counts, base_verify_pat
         child_ideal, child_actual = build_comparison_views(
             expected_node.get('children', []) if expected_node else [],
             actual_node.get('children', []) if actual_node else [],
-            counts, base_verify_path, missing_items, added_items, depth + 1
+            counts, base_verify_path, missing_items, added_items, depth + 1, usage_rows, unreadable_items
         )
         ideal_lines.extend(child_ideal)
         actual_lines.extend(child_actual)
@@ -304,24 +406,221 @@ def get_all_names(structure_nodes, all_names):
         if "children" in node:
             get_all_names(node["children"], all_names)
 
-def get_actual_structure_tree(path, base_path_for_relative_path=""):
-    """Helper to build a tree from the actual file system."""
-    tree = []
+def scan_directory(path, base_path_for_relative_path="", collect_file_names=True):
+    """Walks a folder once with scandir, collecting its subfolder tree and usage.
+
+    'usage' holds this folder's own file count, bytes and newest file mtime plus 'total_*'
+    values rolled up over all subfolders. File sizes come from DirEntry.stat(), which is
+    served from the directory listing on Windows shares, so no extra round trips are made.
+    Only the top folder keeps its full set of file names; subfolders just record 'has_readme'.
+    Symlinks and junctions are not followed. A folder that cannot be listed is returned with
+    'unreadable' set and its error message, rather than looking like an empty folder.
+    """
+    children = []
+    file_names = set()
+    has_readme = False
+    usage = {'files': 0, 'bytes': 0, 'newest': None, 'total_files': 0, 'total_bytes': 0, 'total_newest': None}
+    scanned = {'children': children, 'files': file_names, 'has_readme': False, 'usage': usage, 'unreadable': False, 'error': None}
+
     try:
-        for name in sorted(os.listdir(path)):
-            child_path = os.path.join(path, name)
-            if os.path.isdir(child_path):
-                node = {"name": name, "children": get_actual_structure_tree(child_path, base_path_for_relative_path)}
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError as e:
+        scanned.update(unreadable=True, error=str(e))
+        return scanned
+
+    for entry in entries:
+        try:
+            if entry.is_symlink() or (hasattr(entry, 'is_junction') and entry.is_junction()):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                sub = scan_directory(entry.path, base_path_for_relative_path, collect_file_names=False)
+                node = {"name": entry.name, "children": sub['children'], "has_readme": sub['has_readme'], "usage": sub['usage']}
+                if sub['unreadable']:
+                    node['unreadable'] = True
                 if base_path_for_relative_path:
-                    node['path'] = os.path.relpath(child_path, base_path_for_relative_path)
-                tree.append(node)
-    except FileNotFoundError:
-        pass
-    return tree
+                    node['path'] = os.path.relpath(entry.path, base_path_for_relative_path)
+                children.append(node)
+
+                usage['total_files'] += sub['usage']['total_files']
+                usage['total_bytes'] += sub['usage']['total_bytes']
+                usage['total_newest'] = latest_timestamp(usage['total_newest'], sub['usage']['total_newest'])
+            elif entry.is_file(follow_symlinks=False):
+                stat = entry.stat(follow_symlinks=False)
+                if collect_file_names:
+                    file_names.add(entry.name)
+                if entry.name == 'README.txt':
+                    has_readme = True
+                usage['files'] += 1
+                usage['bytes'] += stat.st_size
+                usage['newest'] = latest_timestamp(usage['newest'], stat.st_mtime)
+        except OSError:
+            # A single file that vanished or cannot be stat'ed is left out of the usage
+            continue
+
+    usage['total_files'] += usage['files']
+    usage['total_bytes'] += usage['bytes']
+    usage['total_newest'] = latest_timestamp(usage['total_newest'], usage['newest'])
+    scanned['has_readme'] = has_readme
+    return scanned
+
+def latest_timestamp(a, b):
+    """Returns the later of two mtimes, where either may be None."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+def format_size(num_bytes):
+    """Formats a byte count as a short human readable string, e.g. '3.4 MB'."""
+    size = float(num_bytes)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{int(size)} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+def usage_to_json(usage):
+    """Converts a usage dict into JSON friendly values with ISO timestamps."""
+    as_json = dict(usage)
+    for key in ('newest', 'total_newest'):
+        as_json[key] = datetime.datetime.fromtimestamp(usage[key]).isoformat(timespec='seconds') if usage[key] else None
+    return as_json
+
+app.add_template_filter(format_size, 'filesize')
+
+def verify_client_folder(path_to_verify, structure, display_name, write_log=True):
+    """Walks one client folder, compares it with the template and returns the result.
+
+    The caller is expected to hold a share slot. If the folder itself cannot be read the
+    result carries an 'error_message' instead of reporting every template folder as missing.
+    """
+    scanned = scan_directory(path_to_verify, path_to_verify)
+    counts = {'green': 0, 'red': 0, 'yellow': 0, 'error': 0}
+    root_name = f"<b>{display_name}/</b>"
+    usage = {'client': display_name, 'path': path_to_verify, **usage_to_json(scanned['usage']), 'folders': []}
+
+    if scanned['unreadable']:
+        error_message = f"Could not read folder '{path_to_verify}': {scanned['error']}"
+        counts['error'] = 1
+        return {'name': display_name, 'success': False, 'error_message': error_message,
+                'ideal': [root_name], 'actual': [root_name, f'<span class="status-red">{html.escape(error_message)}</span>'],
+                'counts': counts, 'missing': [], 'added': [], 'unreadable': [path_to_verify], 'usage': usage}
+
+    missing_items = []
+    added_items = []
+    unreadable_items = []
+    ideal_lines, actual_lines = build_comparison_views(structure, scanned['children'], counts, path_to_verify, missing_items, added_items,
+                                                       usage_rows=usage['folders'], unreadable_items=unreadable_items)
+    ideal_lines.insert(0, root_name)
+    actual_lines.insert(0, root_name)
+
+    # Check for root-level files
+    root_files = scanned['files']
+    for required_file in ['log.txt', 'DirectoryStructure.txt']:
+        if required_file in root_files:
+            ideal_lines.append(f'<span class="status-green">├── {required_file}</span>')
+            actual_lines.append(f'<span class="status-green">├── {required_file}</span>')
+        else:
+            ideal_lines.append(f'<span class="status-red">├── {required_file}</span>')
+            actual_lines.append(f'<span class="status-placeholder">├── </span>')
+            counts['red'] += 1
+            missing_items.append(os.path.join(path_to_verify, required_file))
 
-# === TASK MANAGEMENT FOR BATCH VERIFICATION ===
+    if write_log:
+        # Write verification results to the log.txt for this specific folder
+        write_verification_log(path_to_verify, counts, missing_items, added_items, unreadable_items)
+
+    has_discrepancies = any(v > 0 for k, v in counts.items() if k != 'green')
+    return {'name': display_name, 'success': not has_discrepancies, 'error_message': None,
+            'ideal': ideal_lines, 'actual': actual_lines, 'counts': counts,
+            'missing': missing_items, 'added': added_items, 'unreadable': unreadable_items, 'usage': usage}
+
+# === FILESYSTEM WORK SCHEDULER ===
+class FSScheduler:
+    """Caps concurrent share operations and lets interactive work jump ahead of batch work.
+
+    Every walk or write against the share runs inside `slot(lane)`. Batch slots are only
+    handed out while no interactive request is waiting, so a long batch yields between folders.
+    """
+    LANES = ('interactive', 'batch')
+
+    def __init__(self, max_concurrent):
+        self.max_concurrent = max(1, max_concurrent)
+        self._cond = threading.Condition()
+        self._active = {lane: 0 for lane in self.LANES}
+        self._waiting = {lane: 0 for lane in self.LANES}
+        self._stats = {lane: {'completed': 0, 'total_wait': 0.0, 'max_wait': 0.0, 'last_wait': 0.0} for lane in self.LANES}
+
+    def _can_run(self, lane):
+        if sum(self._active.values()) >= self.max_concurrent:
+            return False
+        if lane == 'batch' and self._waiting['interactive'] > 0:
+            return False
+        return True
+
+    @contextmanager
+    def slot(self, lane):
+        """Blocks until a share slot is free for the given lane, then holds it for the block."""
+        if lane not in self.LANES:
+            raise ValueError(f"Unknown scheduler lane: '{lane}'")
+
+        queued_at = time.monotonic()
+        with self._cond:
+            self._waiting[lane] += 1
+            try:
+                while not self._can_run(lane):
+                    self._cond.wait()
+            finally:
+                self._waiting[lane] -= 1
+                if lane == 'interactive':
+                    # Batch waiters blocked only by this queued request may be able to run now
+                    self._cond.notify_all()
+            self._active[lane] += 1
+
+            waited = time.monotonic() - queued_at
+            stats = self._stats[lane]
+            stats['total_wait'] += waited
+            stats['max_wait'] = max(stats['max_wait'], waited)
+            stats['last_wait'] = waited
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active[lane] -= 1
+                self._stats[lane]['completed'] += 1
+                self._cond.notify_all()
+
+    def snapshot(self):
+        """Returns queue depth, active slots and wait times (in ms) per lane."""
+        with self._cond:
+            lanes = {}
+            for lane in self.LANES:
+                stats = self._stats[lane]
+                granted = stats['completed'] + self._active[lane]
+                lanes[lane] = {
+                    'queued': self._waiting[lane],
+                    'active': self._active[lane],
+                    'completed': stats['completed'],
+                    'avg_wait_ms': round(stats['total_wait'] / granted * 1000, 1) if granted else 0.0,
+                    'max_wait_ms': round(stats['max_wait'] * 1000, 1),
+                    'last_wait_ms': round(stats['last_wait'] * 1000, 1),
+                }
+            return {'max_concurrent': self.max_concurrent, 'lanes': lanes}
+
+fs_scheduler = FSScheduler(FS_MAX_CONCURRENT)
+
+# === TASK MANAGEMENT FOR BACKGROUND JOBS ===
 tasks = {} # In-memory store for background tasks
 
+def prune_finished_tasks():
+    """Drops tasks that finished more than TASK_RETENTION_SECONDS ago."""
+    cutoff = time.time() - TASK_RETENTION_SECONDS
+    for task_id, task in list(tasks.items()):
+        if task.get('finished_at') and task['finished_at'] < cutoff:
+            tasks.pop(task_id, None)
+
 def batch_verification_worker(task_id, selected_folders, base_path, tasks):
     """The actual work of verifying folders, designed to be run in a thread."""
     task = tasks[task_id]
@@ -334,48 +633,32 @@ def batch_verification_worker(task_id, selected_folders, base_path, tasks):
     except Exception as e:
         task['status'] = 'Failed'
         task['results'] = {'error_message': f"Error parsing structure file: {e}"}
+        task['finished_at'] = time.time()
         return
 
-    for i, folder_name in enumerate(selected_folders):
-        # Check for cancellation signal at the start of each loop
-        if task['cancel_event'].is_set():
-            task['status'] = 'Cancelled'
-            return
-
-        path_to_verify = os.path.join(base_path, folder_name)
-        actual_tree = get_actual_structure_tree(path_to_verify, path_to_verify)
-        
-        counts = {'green': 0, 'red': 0, 'yellow': 0}
-        missing_items = []
-        added_items = []
-        ideal_lines, actual_lines = build_comparison_views(structure_template, actual_tree, counts, path_to_verify, missing_items, added_items)
-        
-        root_name = f"<b>{folder_name}/</b>"
-        ideal_lines.insert(0, root_name)
-        actual_lines.insert(0, root_name)
-        
-        # Check for root-level files
-        root_files = get_files_in_path(path_to_verify)
-        for required_file in ['log.txt', 'DirectoryStructure.txt']:
-            if required_file in root_files:
-                ideal_lines.append(f'<span class="status-green">├── {required_file}</span>')
-                actual_lines.append(f'<span class="status-green">├── {required_file}</span>')
-            else:
-                ideal_lines.append(f'<span class="status-red">├── {required_file}</span>')
-                actual_lines.append(f'<span class="status-placeholder">├── </span>')
-                counts['red'] += 1
-                missing_items.append(os.path.join(path_to_verify, required_file))
-
-        # Write verification results to the log.txt for this specific folder
-        write_verification_log(path_to_verify, counts, missing_items, added_items)
-
-        has_discrepancies = any(v > 0 for k, v in counts.items() if k != 'green')
-        
-        results.append({'name': folder_name, 'success': not has_discrepancies, 'ideal': ideal_lines, 'actual': actual_lines, 'counts': counts})
-        task['progress'] = ((i + 1) / total_folders) * 100
+    try:
+        for i, folder_name in enumerate(selected_folders):
+            # Check for cancellation signal at the start of each loop
+            if task['cancel_event'].is_set():
+                task['status'] = 'Cancelled'
+                task['finished_at'] = time.time()
+                return
+
+            path_to_verify = os.path.join(base_path, folder_name)
+            # Each folder takes a batch slot, so queued interactive requests get the share first
+            with fs_scheduler.slot('batch'):
+                results.append(verify_client_folder(path_to_verify, structure_template, folder_name))
+            task['progress'] = ((i + 1) / total_folders) * 100
+    except Exception as e:
+        # Never leave the task stuck in 'Running'
+        task['status'] = 'Failed'
+        task['results'] = {'error_message': f"Error verifying folders: {e}"}
+        task['finished_at'] = time.time()
+        return
 
     task['results'] = results
     task['status'] = 'Completed'
+    task['finished_at'] = time.time()
 
     if task['cancelled']:
         print(f"Task {task_id} has been cancelled")
@@ -410,8 +693,53 @@ def batch_verification_worker(task_id, selected_folders, base_path, tasks):
     """
     send_email(summary_html, email_subject)
 
+def client_creation_worker(task_id, clients, base_path, structure, parser_logs, lane, tasks):
+    """Creates folders for many clients with bounded parallelism, designed to be run in a thread."""
+    task = tasks[task_id]
+    task['status'] = 'Running'
+    total_clients = len(clients)
+    finished = 0
+    progress_lock = threading.Lock()
+
+    def process_client(client):
+        nonlocal finished
+        # Clients that have not started yet are skipped once cancellation is requested
+        if task['cancel_event'].is_set():
+            task['clients'][client] = 'Cancelled'
+            return None
+
+        task['clients'][client] = 'Running'
+        try:
+            log_lines = create_client_structure(client, base_path, structure, lane)
+            result = {'name': client, 'success': True, 'logs': log_lines, 'error_message': None}
+        except Exception as e:
+            result = {'name': client, 'success': False, 'logs': [], 'error_message': str(e)}
+        task['clients'][client] = 'Completed' if result['success'] else 'Failed'
+
+        with progress_lock:
+            finished += 1
+            task['progress'] = (finished / total_clients) * 100
+        return result
+
+    max_workers = min(CREATE_MAX_WORKERS, len(clients))
+    if lane == 'batch':
+        # Leave at least one share slot free for interactive requests
+        max_workers = min(max_workers, fs_scheduler.max_concurrent - 1)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        results = [r for r in executor.map(process_client, clients) if r is not None]
+
+    # Keep the results of clients already built so they can still be reviewed after a cancel
+    task['results'] = {'clients': results, 'parser_logs': parser_logs}
+    task['status'] = 'Cancelled' if task['cancel_event'].is_set() else 'Completed'
+    task['finished_at'] = time.time()
+
 # === FLASK WEB ROUTES ===
 
+@app.errorhandler(413)
+def request_too_large(e):
+    """Returns a readable error when an upload exceeds MAX_UPLOAD_MB."""
+    return {"error": f"Upload is too large. The maximum size is {MAX_UPLOAD_MB} MB."}, 413
+
 @app.route('/', methods=['GET'])
 def index():
     """Renders the main input page."""
@@ -476,7 +804,8 @@ def batch_verify():
     subdirectories = []
     if path_to_scan and os.path.isdir(path_to_scan):
         try:
-            subdirectories = sorted([d for d in os.listdir(path_to_scan) if os.path.isdir(os.path.join(path_to_scan, d))])
+            with fs_scheduler.slot('interactive'):
+                subdirectories = sorted([d for d in os.listdir(path_to_scan) if os.path.isdir(os.path.join(path_to_scan, d))])
         except OSError as e:
             flash(f"Error reading directory: {e}", "error")
 
@@ -491,11 +820,13 @@ def start_batch_task():
     if not selected_folders:
         return {"error": "No folders selected"}, 400
 
+    prune_finished_tasks()
     task_id = str(uuid.uuid4())
     cancel_event = threading.Event()
     
     thread = threading.Thread(target=batch_verification_worker, args=(task_id, selected_folders, base_path, tasks))
     tasks[task_id] = {
+        'kind': 'verify',
         'thread': thread,
         'cancel_event': cancel_event,
         'status': 'Pending',
@@ -513,7 +844,10 @@ def task_status(task_id):
     task = tasks.get(task_id)
     if not task:
         return {"status": "Not Found"}, 404
-    return {"status": task['status'], "progress": task.get('progress', 0)}
+    status = {"status": task['status'], "progress": task.get('progress', 0)}
+    if 'clients' in task:
+        status["clients"] = task['clients']
+    return status
 
 @app.route('/cancel_task/<task_id>', methods=['POST'])
 def cancel_task(task_id):
@@ -525,13 +859,30 @@ def cancel_task(task_id):
         return {"message": "Cancellation signal sent."}
     return {"message": "Task not found."}, 404
 
+@app.route('/scheduler_status')
+def scheduler_status():
+    """Reports queue depth and wait times for the share I/O scheduler."""
+    return fs_scheduler.snapshot()
+
 @app.route('/task_result/<task_id>')
 def task_result(task_id):
-    """Renders the results page for a completed task."""
-    task = tasks.pop(task_id, None) # Use pop to remove the task after fetching
+    """Renders the results page for a completed task, or returns folder usage as JSON with ?format=json."""
+    if request.args.get('format') == 'json':
+        task = tasks.get(task_id)
+        if not task or task['status'] != 'Completed' or task.get('kind') != 'verify':
+            return {"error": "No completed verification task found."}, 404
+        return {"usage": [result['usage'] for result in task['results']]}
+
+    # Finished tasks are kept (see prune_finished_tasks) so results can be reopened and downloaded later
+    task = tasks.get(task_id)
+    if task and task.get('kind') == 'create':
+        if task['status'] not in ('Completed', 'Cancelled'):
+            return redirect(url_for('index'))
+        return render_template('create_result.html', results=task['results']['clients'], parser_logs=task['results']['parser_logs'],
+                               cancelled=task['status'] == 'Cancelled')
     if not task or task['status'] != 'Completed':
         return redirect(url_for('batch_verify'))
-    return render_template('batch_result.html', results=task['results'])
+    return render_template('batch_result.html', results=task['results'], task_id=task_id)
 
 @app.route('/verify', methods=['POST'])
 def verify_folders():
@@ -550,103 +901,100 @@ def verify_folders():
     except Exception as e:
         return render_template('result.html', success=False, error_message=f"Error parsing structure file: {e}")
 
-    # 1. Get actual structure from disk
-    actual_tree = get_actual_structure_tree(path_to_verify, path_to_verify)
+    with fs_scheduler.slot('interactive'):
+        result = verify_client_folder(path_to_verify, structure, os.path.basename(os.path.normpath(path_to_verify)))
 
-    # 3. Recursively build the comparison trees and count statuses
-    counts = {'green': 0, 'red': 0, 'yellow': 0}
-    missing_items = []
-    added_items = []
-    ideal_lines, actual_lines = build_comparison_views(structure, actual_tree, counts, path_to_verify, missing_items, added_items)
+    if request.values.get('format') == 'json':
+        return {"success": result['success'], "error_message": result['error_message'], "counts": result['counts'],
+                "missing": result['missing'], "added": result['added'], "unreadable": result['unreadable'], "usage": result['usage']}
 
-    # 4. Prepend the root folder name
-    root_name = f"<b>{os.path.basename(os.path.normpath(path_to_verify))}/</b>"
-    ideal_lines.insert(0, root_name)
-    actual_lines.insert(0, root_name)
-
-    # Check for root-level files
-    root_files = get_files_in_path(path_to_verify)
-    for required_file in ['log.txt', 'DirectoryStructure.txt']:
-        if required_file in root_files:
-            ideal_lines.append(f'<span class="status-green">├── {required_file}</span>')
-            actual_lines.append(f'<span class="status-green">├── {required_file}</span>')
-        else:
-            ideal_lines.append(f'<span class="status-red">├── {required_file}</span>')
-            actual_lines.append(f'<span class="status-placeholder">├── </span>')
-            counts['red'] += 1
-            missing_items.append(os.path.join(path_to_verify, required_file))
-
-    # Write verification results to the log.txt
-    write_verification_log(path_to_verify, counts, missing_items, added_items)
-
-    # 5. Determine overall success
-    has_discrepancies = any(v > 0 for k, v in counts.items() if k != 'green')
+    if result['error_message']:
+        return render_template('result.html', success=False, error_message=result['error_message'])
 
     return render_template(
         'result.html',
         is_verification=True,
-        success=not has_discrepancies,
-        ideal_structure=ideal_lines,
-        actual_structure=actual_lines,
-        counts=counts
+        success=result['success'],
+        ideal_structure=result['ideal'],
+        actual_structure=result['actual'],
+        counts=result['counts'],
+        usage=result['usage'],
+        verify_path=path_to_verify
     )
-@app.route('/create', methods=['POST'])
-def create_folders():
-    """Handles the form submission and creates folders."""
-    client_input = request.form.get('client_names')
-    if not client_input:
-        flash("No client name provided. Please enter at least one client name.", "error")
-        return redirect(url_for('index'))
 
-    structure_file = "Client_Structure.txt"
-    if not os.path.exists(structure_file):
-        return render_template('result.html', success=False, error_message=f"Structure file '{structure_file}' not found!")
+@app.route('/verify_usage', methods=['GET'])
+def verify_usage():
+    """Returns folder usage for one client folder as JSON, without writing log.txt or changes.txt."""
+    path_to_verify = request.args.get('path', '').strip()
+    if not path_to_verify:
+        return {"error": "No folder path provided."}, 400
 
-    all_logs = []
-    
     try:
-        log_lines_parser = []
-        base_path, structure = parse_structure_file(structure_file, log_lines_parser)
-        if log_lines_parser:
-            all_logs.extend(log_lines_parser)
-            all_logs.append("-" * 20)
-
+        _, structure = parse_structure_file("Client_Structure.txt", [])
     except Exception as e:
-        return render_template('result.html', success=False, error_message=str(e))
+        return {"error": f"Error parsing structure file: {e}"}, 400
 
-    clients = [c.strip() for c in client_input.split(",") if c.strip()]
+    with fs_scheduler.slot('interactive'):
+        result = verify_client_folder(path_to_verify, structure, os.path.basename(os.path.normpath(path_to_verify)), write_log=False)
 
-    for client in clients:
-        log_lines = []
-        dir_lines = []
+    if result['error_message']:
+        return {"error": result['error_message']}, 400
+    return {"usage": result['usage']}
 
-        log_lines.append(f"\n=== Run started on {current_date_time()} for client: {client} ===\n")
+@app.route('/create', methods=['POST'])
+def create_folders():
+    """Starts folder creation for the submitted clients as a background task."""
+    clients = [c.strip() for c in request.form.get('client_names', '').split(",") if c.strip()]
 
-        client_folder = os.path.join(base_path, sanitize_folder_name(client))
-        if not os.path.exists(client_folder):
-            os.makedirs(client_folder)
-            log_lines.append(f"[{timestamp()}] Created client main folder: {client_folder}")
-        else:
-            log_lines.append(f"[{timestamp()}] Client folder already exists: {client_folder}")
+    client_csv = request.files.get('client_csv')
+    from_csv = bool(client_csv and client_csv.filename)
+    if from_csv:
+        try:
+            clients.extend(parse_client_csv(client_csv))
+        except (UnicodeDecodeError, csv.Error) as e:
+            return {"error": f"Could not read CSV file: {e}"}, 400
 
-        dir_lines.append(f"{client}/")
+    # Drop names that map to the same folder on the (case-insensitive) share, keeping the first,
+    # so two workers never build or log into the same client folder
+    unique_clients = {}
+    for client in clients:
+        unique_clients.setdefault(sanitize_folder_name(client).casefold(), client)
+    clients = list(unique_clients.values())
+    if not clients:
+        return {"error": "No client name provided. Please enter at least one client name."}, 400
 
-        create_structure(client_folder, structure, log_lines, dir_lines, depth=1)
+    structure_file = "Client_Structure.txt"
+    if not os.path.exists(structure_file):
+        return {"error": f"Structure file '{structure_file}' not found!"}, 400
 
-        # Append logs to existing log.txt
-        with open(os.path.join(client_folder, "log.txt"), "a", encoding="utf-8") as f:
-            f.write("\n".join(log_lines))
-            f.write("\n")
+    try:
+        parser_logs = []
+        base_path, structure = parse_structure_file(structure_file, parser_logs)
+    except Exception as e:
+        return {"error": str(e)}, 400
 
-        header = f"Directory Structure for Client: {client}\nGenerated on: {current_date_time()}\n\n"
-        with open(os.path.join(client_folder, "DirectoryStructure.txt"), "w", encoding="utf-8") as f:
-            f.write(header)
-            f.write("\n".join(dir_lines))
-            f.write("\n\nThis folder structure was auto-generated by the Acutant Folder Builder Tool.")
-        
-        all_logs.extend(log_lines)
+    # A few typed-in clients are someone waiting at the UI; bulk lists and CSV uploads are batch work
+    lane = 'interactive' if not from_csv and len(clients) <= INTERACTIVE_CREATE_LIMIT else 'batch'
+
+    prune_finished_tasks()
+    task_id = str(uuid.uuid4())
+    cancel_event = threading.Event()
+
+    thread = threading.Thread(target=client_creation_worker, args=(task_id, clients, base_path, structure, parser_logs, lane, tasks))
+    tasks[task_id] = {
+        'kind': 'create',
+        'lane': lane,
+        'thread': thread,
+        'cancel_event': cancel_event,
+        'status': 'Pending',
+        'progress': 0,
+        'cancelled': False,
+        'clients': {client: 'Pending' for client in clients},
+        'results': None
+    }
+    thread.start()
 
-    return render_template('result.html', success=True, logs=all_logs)
+    return {"task_id": task_id, "total": len(clients)}
 
 if __name__ == "__main__":
     # Use host='0.0.0.0' to make it accessible on your network